@@ -12,6 +12,7 @@ class ComputedfieldsConfig(AppConfig):
         super(ComputedfieldsConfig, self).__init__(*args, **kwargs)
         class_prepared.connect(BOOT_RESOLVER.add_model)
         self.settings = settings
+        self.handler_connections = []
 
 
     def ready(self):
@@ -28,19 +29,13 @@ class ComputedfieldsConfig(AppConfig):
         # normal startup
         BOOT_RESOLVER.initialize()
 
-        # connect signals
-        from computedfields.handlers import (
-            postsave_handler, predelete_handler, postdelete_handler, m2m_handler, get_old_handler)
-        from django.db.models.signals import (
-            post_save, m2m_changed, pre_delete, post_delete, pre_save)
-
-        pre_save.connect(
-            get_old_handler, sender=None, weak=False, dispatch_uid='COMP_FIELD_PRESAVE')
-        post_save.connect(
-            postsave_handler, sender=None, weak=False, dispatch_uid='COMP_FIELD')
-        pre_delete.connect(
-            predelete_handler, sender=None, weak=False, dispatch_uid='COMP_FIELD_PREDELETE')
-        post_delete.connect(
-            postdelete_handler, sender=None, weak=False, dispatch_uid='COMP_FIELD_POSTDELETE')
-        m2m_changed.connect(
-            m2m_handler, sender=None, weak=False, dispatch_uid='COMP_FIELD_M2M')
+        # connect signals, resync them whenever the maps get recreated
+        self.resync_handlers()
+        BOOT_RESOLVER.add_maps_hook(self.resync_handlers)
+
+    def resync_handlers(self):
+        """
+        Connect the signal handlers to the senders in the current resolver maps.
+        """
+        from computedfields.handlers import connect_handlers
+        self.handler_connections = connect_handlers(self.handler_connections)
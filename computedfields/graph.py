@@ -71,7 +71,7 @@ IInterimTable = Dict[Type[Model], Dict[str, Dict[Type[Model], Dict[str, List[IDe
 # LookupMap: {srcModel: {srcfield: {cfModel, ({querystrings}, {cfields})}}}
 ILookupMap = Dict[Type[Model], Dict[str, Dict[Type[Model], Tuple[Set[str], Set[str]]]]]
 # fk map: {Model: {fkname, ...}}
-IFkMap = Dict[Type[Model], Set[str]]
+IFkMap = Dict[Type[Model], FrozenSet[str]]
 # local MRO: {Model: {'base': [mro of all fields], 'fields': {fname: bitarray into base}}}
 ILocalMroMap = Dict[Type[Model], ILocalMroData]
 
@@ -688,7 +688,7 @@ class ComputedModelsGraph(Graph):
         for model, paths in path_map.items():
             value = self._get_fk_fields(model, paths)
             if value:
-                fk_map[model] = value
+                fk_map[model] = frozenset(value)
 
         return lookup_map, fk_map
 
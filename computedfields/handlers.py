@@ -2,36 +2,52 @@
 Module containing the database signal handlers.
 
 The handlers are registered during application startup
-in ``apps.ready``.
+in ``apps.ready``. They only get connected for models,
+that are senders in the resolver maps, thus Django skips
+them for all other models.
 
 .. NOTE::
 
     The handlers are not registered in the managment
     commands ``makemigrations``, ``migrate`` and ``help``.
 """
-from threading import local
+from contextvars import ContextVar
+from weakref import WeakKeyDictionary
 from django.db import transaction
+from django.db.models.signals import post_save, m2m_changed, pre_delete, post_delete, pre_save
 from .resolver import active_resolver
 from .settings import settings
 
 # typing imports
-from typing import Any, Dict, Iterable, List, Set, Type, cast
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Set, Tuple, Type
 from django.db.models import Model
+from django.dispatch import Signal
 
+IStorage = MutableMapping[Model, Dict[Type[Model], List[Any]]]
+IConnection = Tuple[Signal, Type[Model], str]
 
 
-# thread local storage to hold
+# context local storage to hold
 # the pk lists for deletes/updates
-STORAGE = local()
-STORAGE.DELETES = {}
-STORAGE.M2M_REMOVE = {}
-STORAGE.M2M_CLEAR = {}
-STORAGE.UPDATE_OLD = {}
+# (isolated per thread, asyncio tasks share the storage
+# of the context they got created from)
+# weakly keyed, so entries of instances, that never reached
+# their post_* signal (e.g. due to an exception), dont leak
+DELETES: ContextVar[Optional[IStorage]] = ContextVar('COMP_FIELD_DELETES', default=None)
+M2M_REMOVE: ContextVar[Optional[IStorage]] = ContextVar('COMP_FIELD_M2M_REMOVE', default=None)
+M2M_CLEAR: ContextVar[Optional[IStorage]] = ContextVar('COMP_FIELD_M2M_CLEAR', default=None)
+UPDATE_OLD: ContextVar[Optional[IStorage]] = ContextVar('COMP_FIELD_UPDATE_OLD', default=None)
 
-DELETES = STORAGE.DELETES
-M2M_REMOVE = STORAGE.M2M_REMOVE
-M2M_CLEAR = STORAGE.M2M_CLEAR
-UPDATE_OLD = STORAGE.UPDATE_OLD
+
+def get_storage(var: ContextVar[Optional[IStorage]]) -> IStorage:
+    """
+    Get the storage of `var` for the current context, create it on first access.
+    """
+    storage = var.get()
+    if storage is None:
+        storage = WeakKeyDictionary()
+        var.set(storage)
+    return storage
 
 
 def get_old_handler(sender: Type[Model], instance: Model, **kwargs) -> None:
@@ -55,11 +71,9 @@ def get_old_handler(sender: Type[Model], instance: Model, **kwargs) -> None:
     # exit early if model contains no contributing fk fields
     if not contributing_fks:
         return
-    candidates = set(contributing_fks)
-    if kwargs.get('update_fields'):
-        candidates &= set(cast(Iterable[str], kwargs.get('update_fields')))
     # exit early if no contributing fk field will be updated
-    if not candidates:
+    update_fields = kwargs.get('update_fields')
+    if update_fields and contributing_fks.isdisjoint(update_fields):
         return
     # we got an update instance with possibly dirty fk fields
     # we do simply a full update on all old related fk records for now
@@ -67,7 +81,7 @@ def get_old_handler(sender: Type[Model], instance: Model, **kwargs) -> None:
     #        filter by individual field changes instead? (tests are ~10% slower)
     data = active_resolver.preupdate_dependent(instance, sender)
     if data:
-        UPDATE_OLD[instance] = data
+        get_storage(UPDATE_OLD)[instance] = data
     return
 
 
@@ -79,13 +93,21 @@ def postsave_handler(sender: Type[Model], instance: Model, **kwargs) -> None:
     Skipped during fixtures.
     """
     # do not update for fixtures
-    if not kwargs.get('raw'):
-        active_resolver.update_dependent(
-            instance, sender, kwargs.get('update_fields'),
-            old=UPDATE_OLD.pop(instance, None),
-            update_local=False,
-            querysize=settings.COMPUTEDFIELDS_QUERYSIZE
-        )
+    if kwargs.get('raw'):
+        return
+    old = get_storage(UPDATE_OLD).pop(instance, None)
+    update_fields = kwargs.get('update_fields')
+    # exit early if no updated field has dependents
+    # (update_dependent would not create any update querysets either)
+    modeldata = active_resolver._map.get(sender)
+    if not modeldata or (update_fields and modeldata.keys().isdisjoint(update_fields)):
+        return
+    active_resolver.update_dependent(
+        instance, sender, update_fields,
+        old=old,
+        update_local=False,
+        querysize=settings.COMPUTEDFIELDS_QUERYSIZE
+    )
 
 
 def predelete_handler(sender: Type[Model], instance: Model, **_) -> None:
@@ -93,13 +115,13 @@ def predelete_handler(sender: Type[Model], instance: Model, **_) -> None:
     ``pre_delete`` handler.
 
     Gets all dependent objects as pk lists and saves
-    them in thread local storage.
+    them in context local storage.
     """
     # get the querysets as pk lists to hold them in storage
     # we have to get pks here since the queryset will be empty after deletion
     data = active_resolver._querysets_for_update(sender, instance, pk_list=True)
     if data:
-        DELETES[instance] = data
+        get_storage(DELETES)[instance] = data
 
 
 def postdelete_handler(sender: Type[Model], instance: Model, **kwargs) -> None:
@@ -110,31 +132,9 @@ def postdelete_handler(sender: Type[Model], instance: Model, **kwargs) -> None:
     and updates them.
     """
     # after deletion we can update the associated computed fields
-    updates = DELETES.pop(instance, None)
+    updates = get_storage(DELETES).pop(instance, None)
     if updates:
-        with transaction.atomic():
-            for model, [pks, fields] in updates.items():
-                active_resolver.bulk_updater(
-                    model._base_manager.filter(pk__in=pks),
-                    fields,
-                    querysize=settings.COMPUTEDFIELDS_QUERYSIZE
-                )
-
-
-def merge_pk_maps(
-    obj1: Dict[Type[Model], List[Any]],
-    obj2: Dict[Type[Model], List[Any]]
-) -> Dict[Type[Model], List[Any]]:
-    """
-    Merge pk map in `obj2` on `obj1`.
-    Updates obj1 inplace and also returns it.
-    """
-    for model, data in obj2.items():
-        m2_pks, m2_fields = data
-        m1_pks, m1_fields = obj1.setdefault(model, [set(), set()])
-        m1_pks.update(m2_pks)
-        m1_fields.update(m2_fields)
-    return obj1
+        active_resolver.bulk_updater_many(updates, querysize=settings.COMPUTEDFIELDS_QUERYSIZE)
 
 
 def merge_qs_maps(
@@ -167,13 +167,16 @@ def m2m_handler(sender: Type[Model], instance: Model, **kwargs) -> None:
     # exit early if we have no update rule on the through model
     if not fields:
         return
+    action = kwargs['action']
+    # pre_add needs no handling
+    if action == 'pre_add':
+        return
 
     # since the graph does not handle the m2m through model
     # we have to trigger updates for both ends (left and right side)
     reverse = kwargs['reverse']
     left = fields['right'] if reverse else fields['left']   # fieldname on instance
     right = fields['left'] if reverse else fields['right']  # fieldname on model
-    action = kwargs.get('action')
     model = kwargs['model']
 
     if action == 'post_add':
@@ -195,43 +198,61 @@ def m2m_handler(sender: Type[Model], instance: Model, **kwargs) -> None:
 
     elif action == 'pre_remove':
         pks_remove: Set[Any] = kwargs['pk_set']
-        data_remove: Dict[Type[Model], List[Any]] = active_resolver._querysets_for_update(
-            type(instance), instance, update_fields={left}, pk_list=True)
-        other_remove: Dict[Type[Model], List[Any]] = active_resolver._querysets_for_update(
-            model, model._base_manager.filter(pk__in=pks_remove), update_fields={right}, pk_list=True, m2m=instance)
-        if other_remove:
-            merge_pk_maps(data_remove, other_remove)
+        data_remove: Dict[Type[Model], List[Any]] = active_resolver._querysets_for_update_multi((
+            (type(instance), instance, {left}, None),
+            (model, model._base_manager.filter(pk__in=pks_remove), {right}, instance)
+        ))
         if data_remove:
-            M2M_REMOVE[instance] = data_remove
+            get_storage(M2M_REMOVE)[instance] = data_remove
 
     elif action == 'post_remove':
-        updates_remove: Dict[Type[Model], List[Any]] = M2M_REMOVE.pop(instance, None)
+        updates_remove: Dict[Type[Model], List[Any]] = get_storage(M2M_REMOVE).pop(instance, None)
         if updates_remove:
-            with transaction.atomic():
-                for _model, [pks, update_fields] in updates_remove.items():
-                    active_resolver.bulk_updater(
-                        _model._base_manager.filter(pk__in=pks),
-                        update_fields,
-                        querysize=settings.COMPUTEDFIELDS_QUERYSIZE
-                    )
+            active_resolver.bulk_updater_many(
+                updates_remove, querysize=settings.COMPUTEDFIELDS_QUERYSIZE)
 
     elif action == 'pre_clear':
-        data: Dict[Type[Model], List[Any]] = active_resolver._querysets_for_update(
-            type(instance), instance, update_fields={left}, pk_list=True)
-        other: Dict[Type[Model], List[Any]] = active_resolver._querysets_for_update(
-            model, getattr(instance, left).all(), update_fields={right}, pk_list=True, m2m=instance)
-        if other:
-            merge_pk_maps(data, other)
+        data: Dict[Type[Model], List[Any]] = active_resolver._querysets_for_update_multi((
+            (type(instance), instance, {left}, None),
+            (model, getattr(instance, left).all(), {right}, instance)
+        ))
         if data:
-            M2M_CLEAR[instance] = data
+            get_storage(M2M_CLEAR)[instance] = data
 
     elif action == 'post_clear':
-        updates_clear: Dict[Type[Model], List[Any]] = M2M_CLEAR.pop(instance, None)
+        updates_clear: Dict[Type[Model], List[Any]] = get_storage(M2M_CLEAR).pop(instance, None)
         if updates_clear:
-            with transaction.atomic():
-                for _model, [pks, update_fields] in updates_clear.items():
-                    active_resolver.bulk_updater(
-                        _model._base_manager.filter(pk__in=pks),
-                        update_fields,
-                        querysize=settings.COMPUTEDFIELDS_QUERYSIZE
-                    )
+            active_resolver.bulk_updater_many(
+                updates_clear, querysize=settings.COMPUTEDFIELDS_QUERYSIZE)
+
+
+def connect_handlers(stale: Iterable[IConnection] = ()) -> List[IConnection]:
+    """
+    Connect the signal handlers to the senders in the maps of the active resolver.
+
+    The connections in `stale` get disconnected first, thus passing the result
+    of an earlier call resyncs the handlers after a map recreation.
+    Returns the made connections as `(signal, sender, dispatch_uid)` tuples.
+    """
+    disconnect_handlers(stale)
+    connections: List[IConnection] = []
+    rules = (
+        (pre_save, get_old_handler, active_resolver._fk_map, 'COMP_FIELD_PRESAVE'),
+        (post_save, postsave_handler, active_resolver._map, 'COMP_FIELD'),
+        (pre_delete, predelete_handler, active_resolver._map, 'COMP_FIELD_PREDELETE'),
+        (post_delete, postdelete_handler, active_resolver._map, 'COMP_FIELD_POSTDELETE'),
+        (m2m_changed, m2m_handler, active_resolver._m2m, 'COMP_FIELD_M2M')
+    )
+    for signal, handler, senders, uid in rules:
+        for sender in senders:
+            signal.connect(handler, sender=sender, weak=False, dispatch_uid=uid)
+            connections.append((signal, sender, uid))
+    return connections
+
+
+def disconnect_handlers(connections: Iterable[IConnection]) -> None:
+    """
+    Disconnect signal handlers connected by ``connect_handlers``.
+    """
+    for signal, sender, uid in connections:
+        signal.disconnect(sender=sender, dispatch_uid=uid)
@@ -4,9 +4,9 @@ Contains the resolver logic for automated computed field updates.
 import operator
 from collections import OrderedDict
 from functools import reduce
-from itertools import zip_longest
+from itertools import islice, zip_longest
 
-from django.db import transaction
+from django.db import connections, transaction
 from django.db.models import QuerySet
 from django.core.exceptions import FieldDoesNotExist
 
@@ -97,6 +97,7 @@ class Resolver:
         self._sealed: bool = False        # initial boot phase
         self._initialized: bool = False   # initialized (computed_models populated)?
         self._map_loaded: bool = False    # final stage with fully loaded maps
+        self._maps_hooks: List[Callable[[], None]] = []
 
     def add_model(self, sender: Type[Model], **kwargs) -> None:
         """
@@ -230,6 +231,7 @@ class Resolver:
                 - `lookup_map`: intermodel dependencies as queryset access strings
                 - `fk_map`: models with their contributing fk fields
                 - `local_mro`: MRO of local computed fields per model
+                - `m2m`: m2m through models with their left/right field names
         """
         self._graph = ComputedModelsGraph(self.computed_models)
         if not getattr(settings, 'COMPUTEDFIELDS_ALLOW_RECURSION', False):
@@ -240,6 +242,14 @@ class Resolver:
         self._extract_m2m_through()
         self._patch_proxy_models()
         self._map_loaded = True
+        for hook in self._maps_hooks:
+            hook()
+
+    def add_maps_hook(self, hook: Callable[[], None]) -> None:
+        """
+        Register `hook` to be called after every map creation in ``load_maps``.
+        """
+        self._maps_hooks.append(hook)
 
     def _extract_m2m_through(self) -> None:
         """
@@ -342,7 +352,6 @@ class Resolver:
         # thus we extract pks explicitly instead
         # TODO: cleanup type mess here including this workaround
         if isinstance(instance, QuerySet):
-            from django.db import connections
             if not instance.query.can_filter() and connections[instance.db].vendor == 'mysql':
                 instance = set(instance.values_list('pk', flat=True).iterator())
 
@@ -385,6 +394,36 @@ class Resolver:
             final[model] = [queryset, fields]
         return final
     
+    def _querysets_for_update_multi(
+        self,
+        sources: Iterable[Tuple[Type[Model], Union[Model, QuerySet], Optional[Iterable[str]], Optional[Model]]]
+    ) -> Dict[Type[Model], List[Any]]:
+        """
+        Same as ``_querysets_for_update`` with `pk_list=True` for multiple sources
+        given as `(model, instance, update_fields, m2m)` tuples.
+
+        Querysets of a dependent model are combined over all sources,
+        thus every dependent model gets selected only once.
+        """
+        final: Dict[Type[Model], List[Any]] = OrderedDict()
+        for model, instance, update_fields, m2m in sources:
+            updates = self._querysets_for_update(model, instance, update_fields, m2m=m2m)
+            for dependent, (queryset, fields) in updates.items():
+                entry = final.get(dependent)
+                if entry is None:
+                    final[dependent] = [queryset, fields]
+                else:
+                    entry[0] = entry[0].union(queryset)
+                    entry[1].update(fields)
+        for dependent, entry in list(final.items()):
+            # same as in _querysets_for_update - drop empty results
+            pks = set(entry[0].values_list('pk', flat=True).iterator())
+            if pks:
+                entry[0] = pks
+            else:
+                del final[dependent]
+        return final
+
     def _get_model(self, instance: Union[Model, QuerySet]) -> Type[Model]:
         return instance.model if isinstance(instance, QuerySet) else type(instance)
 
@@ -517,10 +556,11 @@ class Resolver:
                     if _pks:
                         pks_updated[queryset.model] = _pks
                 if old:
-                    for model2, data in old.items():
-                        pks, fields = data
-                        queryset = model2.objects.filter(pk__in=pks-pks_updated.get(model2, set()))
-                        self.bulk_updater(queryset, fields, querysize=querysize)
+                    for model2, (pks, fields) in old.items():
+                        pks = pks - pks_updated.get(model2, set())
+                        if pks:
+                            self.bulk_updater(
+                                model2._base_manager.filter(pk__in=pks), fields, querysize=querysize)
 
     def bulk_updater(
         self,
@@ -604,6 +644,49 @@ class Resolver:
             self.update_dependent(model._base_manager.filter(pk__in=pks), model, fields, update_local=False)
         return set(pks) if return_pks else None
     
+    def bulk_updater_many(
+        self,
+        updates: Dict[Type[Model], List[Any]],
+        querysize: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> None:
+        """
+        Run ``bulk_updater`` for a mapping of models with pk sets and fields,
+        as created by ``_querysets_for_update_multi``.
+
+        All models are updated within a single transaction. The records are
+        selected in slices of `batch_size` pks, the update of dependent models
+        is done afterwards for slices of the changed records. This keeps the
+        pk parameters of those queries within `batch_size`, which defaults to
+        the parameter limit of the database (e.g. 999 for SQLite), or 10000
+        for databases without a limit. Since all records are updated before
+        their dependents, dependents shared by records of different slices
+        are already in sync after the first cascade slice, but still get
+        selected once per slice.
+        """
+        with transaction.atomic():
+            for model, (pks, fields) in updates.items():
+                size = (batch_size
+                    or connections[model._base_manager.db].features.max_query_params or 10000)
+                mro = set(self.get_local_mro(model, fields))
+                changed: Set[Any] = set()
+                for chunk in self._pk_slices(pks, size):
+                    changed |= self.bulk_updater(
+                        model._base_manager.filter(pk__in=chunk),
+                        fields,
+                        return_pks=True,
+                        local_only=True,
+                        querysize=querysize
+                    ) or set()
+                # same as in bulk_updater - descent only for changed records
+                for chunk in self._pk_slices(changed, size):
+                    self.update_dependent(
+                        model._base_manager.filter(pk__in=chunk), model, mro, update_local=False)
+
+    def _pk_slices(self, pks: Iterable[Any], size: int) -> Generator[List[Any], None, None]:
+        pks_iter = iter(pks)
+        yield from iter(lambda: list(islice(pks_iter, size)), [])
+
     def _update(self, queryset: QuerySet, change: Sequence[Any], fields: Sequence[str]) -> Union[int, None]:
         # we can skip batch_size here, as it already was batched in bulk_updater
         if self.use_fastupdate:
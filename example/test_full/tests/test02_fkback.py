@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from .base import GenericModelTestBase, MODELS
 from ..models import Parent, Child, Subchild, XParent, XChild
 from computedfields.models import update_dependent, preupdate_dependent
@@ -250,4 +252,19 @@ class ForeignKeyBackDependencies(GenericModelTestBase):
         self.xp2.refresh_from_db()
 
         self.assertEqual(self.xp1.children_value, 1111)
-        self.assertEqual(self.xp2.children_value, 0)
\ No newline at end of file
+        self.assertEqual(self.xp2.children_value, 0)
+
+    def test_x_models_fk_change_queries(self):
+        xp1 = XParent.objects.create()
+        xp2 = XParent.objects.create()
+        xc = XChild.objects.create(parent=xp1, value=1)
+        xc.parent = xp2
+        # old relation update must not add extra savepoint queries
+        with CaptureQueriesContext(connection) as queries:
+            xc.save()
+        savepoints = [q for q in queries.captured_queries if q['sql'].startswith('SAVEPOINT')]
+        self.assertEqual(len(savepoints), 1)
+        xp1.refresh_from_db()
+        xp2.refresh_from_db()
+        self.assertEqual(xp1.children_value, 0)
+        self.assertEqual(xp2.children_value, 1)
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from ..models import MAgent, MUser, MItem, MGroup
 
 
@@ -105,3 +107,27 @@ class TestBetterM2M(TestCase):
         a2.refresh_from_db()
         self.assertEqual(a1.counter, 3)   # another touch
         self.assertEqual(a1.counter, 3)   # another touch
+
+    def _agent_selects(self, queries):
+        # selects of dependent agents done by the m2m pre_* signal
+        sqls = [q['sql'] for q in queries.captured_queries]
+        pre = sqls[:[i for i, sql in enumerate(sqls) if sql.startswith('DELETE')][0]]
+        table = connection.ops.quote_name(MAgent._meta.db_table)
+        return [sql for sql in pre if 'FROM ' + table in sql]
+
+    def test_remove_item_from_user_queries(self):
+        # agent is reached from user and item side
+        self.user.items.add(self.item)
+        with CaptureQueriesContext(connection) as queries:
+            self.user.items.remove(self.item)
+        self.assertEqual(len(self._agent_selects(queries)), 1)
+        self.agent.refresh_from_db()
+        self.assertEqual(self.agent.counter, 3)
+
+    def test_clear_items_from_user_queries(self):
+        self.user.items.add(self.item)
+        with CaptureQueriesContext(connection) as queries:
+            self.user.items.clear()
+        self.assertEqual(len(self._agent_selects(queries)), 1)
+        self.agent.refresh_from_db()
+        self.assertEqual(self.agent.counter, 3)
@@ -0,0 +1,30 @@
+import gc
+from threading import Thread
+
+from django.db.models.signals import pre_save
+from django.test import TestCase
+from computedfields.handlers import UPDATE_OLD, get_storage
+from ..models import XParent, XChild
+
+
+class TestHandlerStorage(TestCase):
+    def test_abandoned_entry_reclaimed(self):
+        xc = XChild.objects.create(parent=XParent.objects.create(), value=1)
+        storage = get_storage(UPDATE_OLD)
+        # pre_save without a following post_save, e.g. the save raised
+        pre_save.send(sender=XChild, instance=xc, raw=False, using='default', update_fields=None)
+        self.assertIn(xc, storage)
+        count = len(storage)
+        del xc
+        gc.collect()
+        self.assertEqual(len(storage), count - 1)
+
+    def test_thread_isolation(self):
+        storage = get_storage(UPDATE_OLD)
+        other = []
+        thread = Thread(target=lambda: other.append(get_storage(UPDATE_OLD)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], storage)
+        # stable within the same thread
+        self.assertIs(get_storage(UPDATE_OLD), storage)
@@ -7,9 +7,11 @@ happen during normal operation mode.
 """
 import os
 from django.test import TestCase
-from django.db.models.signals import class_prepared
+from django.apps import apps
+from django.db.models.signals import class_prepared, post_delete, post_save, pre_delete, pre_save
 from django.conf import settings
 from computedfields.resolver import Resolver, active_resolver, ResolverException
+from computedfields.handlers import connect_handlers, get_old_handler
 from .. import models
 
 
@@ -136,6 +138,18 @@ class TestResolverInstance(TestCase):
         with self.assertRaises(ResolverException):
             self.resolver.initialize()
 
+    def test_maps_hook(self):
+        class_prepared.connect(self.resolver.add_model)
+        generate_computedmodel(self.resolver, 'RuntimeGeneratedI', lambda self: self.name.upper())
+        class_prepared.disconnect(self.resolver.add_model)
+
+        calls = []
+        self.resolver.add_maps_hook(lambda: calls.append(self.resolver._map_loaded))
+        self.resolver.initialize()
+        self.assertEqual(calls, [True])
+        self.resolver.load_maps(_force_recreation=True)
+        self.assertEqual(calls, [True, True])
+
     def test_runtime_coverage(self):
         class_prepared.connect(self.resolver.add_model)
         rt_field, rt_model = generate_computedmodel(self.resolver, 'RuntimeGeneratedH', lambda self: self.name.upper())
@@ -154,3 +168,45 @@ class TestResolverInstance(TestCase):
         self.assertEqual(self.resolver.is_computedfield(rt_model, 'name'), False)
         self.assertEqual(self.resolver.is_computedfield(rt_model, 'comp'), True)
         self.assertEqual(self.resolver.is_computedfield(models.Concrete, 'name'), False)
+
+
+class TestHandlerConnections(TestCase):
+    def senders(self, uid):
+        connections = apps.get_app_config('computedfields').handler_connections
+        return [sender for _, sender, _uid in connections if _uid == uid]
+
+    def check_senders(self):
+        self.assertCountEqual(self.senders('COMP_FIELD_PRESAVE'), active_resolver._fk_map.keys())
+        self.assertCountEqual(self.senders('COMP_FIELD'), active_resolver._map.keys())
+        self.assertCountEqual(self.senders('COMP_FIELD_PREDELETE'), active_resolver._map.keys())
+        self.assertCountEqual(self.senders('COMP_FIELD_POSTDELETE'), active_resolver._map.keys())
+        self.assertCountEqual(self.senders('COMP_FIELD_M2M'), active_resolver._m2m.keys())
+
+    def test_connected_senders(self):
+        self.check_senders()
+        # handlers are bound on dispatch level to mapped models only
+        self.assertNotIn(models.Concrete, active_resolver._fk_map)
+        self.assertFalse(pre_save.has_listeners(models.Concrete))
+        self.assertIn(models.Child, active_resolver._map)
+        self.assertTrue(post_save.has_listeners(models.Child))
+        unmapped = next(m for m in apps.get_app_config('test_full').get_models()
+                        if m not in active_resolver._map)
+        self.assertFalse(post_save.has_listeners(unmapped))
+
+    def test_proxymodel_senders(self):
+        self.assertIn(models.ProxyChild, active_resolver._map)
+        for signal in (post_save, pre_delete, post_delete):
+            self.assertTrue(signal.has_listeners(models.ProxyChild))
+
+    def test_resync_on_map_recreation(self):
+        active_resolver.load_maps(_force_recreation=True)
+        self.check_senders()
+
+    def test_stale_connections(self):
+        # a sender, that is not part of the maps anymore
+        stale = [(pre_save, models.Concrete, 'COMP_FIELD_PRESAVE')]
+        pre_save.connect(get_old_handler, sender=models.Concrete, weak=False, dispatch_uid='COMP_FIELD_PRESAVE')
+        self.assertTrue(pre_save.has_listeners(models.Concrete))
+        connections = connect_handlers(stale)
+        self.assertFalse(pre_save.has_listeners(models.Concrete))
+        self.assertCountEqual(connections, apps.get_app_config('computedfields').handler_connections)
@@ -1,6 +1,9 @@
 from django.test import TestCase
-from ..models import DepBaseA, DepBaseB, DepSub1, DepSub2, DepSubFinal
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from ..models import DepBaseA, DepBaseB, DepSub1, DepSub2, DepSubFinal, Parent, Child, Subchild
 from computedfields.models import update_dependent, preupdate_dependent
+from computedfields.resolver import active_resolver
 
 
 class TestUpdateDependency(TestCase):
@@ -135,3 +138,44 @@ class TestUpdateDependency(TestCase):
         self.assertEqual(self.ba2.final_proxy, 'f6f7f8f9f0')
         self.assertEqual(self.bb1.final_proxy, 'f1f2f3f4f5f6f7f8f9f0')
         self.assertEqual(self.bb2.final_proxy, '')
+
+    def test_bulk_updater_many_sliced(self):
+        parent = Parent.objects.create()
+        c1 = Child.objects.create(parent=parent)
+        c2 = Child.objects.create(parent=parent)
+        c3 = Child.objects.create(parent=parent)
+        Subchild.objects.create(subparent=c1)
+        Subchild.objects.create(subparent=c2)
+        Subchild.objects.create(subparent=c2)
+        Subchild.objects.create(subparent=c3)
+        # desync child counts without triggering updates
+        Child.objects.all().update(subchildren_count=0)
+        Parent.objects.all().update(subchildren_count_proxy=0)
+
+        params = []
+        def count_params(execute, sql, sql_params, many, context):
+            params.append((sql, len(sql_params or ())))
+            return execute(sql, sql_params, many, context)
+
+        with CaptureQueriesContext(connection) as queries, connection.execute_wrapper(count_params):
+            active_resolver.bulk_updater_many(
+                {Child: ({c1.pk, c2.pk, c3.pk}, {'subchildren_count'})}, batch_size=2)
+        sqls = [q['sql'] for q in queries.captured_queries]
+
+        # all within one transaction
+        self.assertTrue(sqls[0].startswith('SAVEPOINT'))
+        self.assertEqual(sqls[-1], 'RELEASE ' + sqls[0])
+        # pk parameters stay within batch_size, UPDATEs are batched by bulk_update
+        for sql, count in params:
+            if not sql.startswith('UPDATE'):
+                self.assertLessEqual(count, 2, sql)
+        # shared parent is in sync after the first cascade slice,
+        # as all children got updated before
+        parent_table = connection.ops.quote_name(Parent._meta.db_table)
+        self.assertEqual(len([s for s in sqls if s.startswith('UPDATE ' + parent_table)]), 1)
+
+        for child, count in ((c1, 1), (c2, 2), (c3, 1)):
+            child.refresh_from_db()
+            self.assertEqual(child.subchildren_count, count)
+        parent.refresh_from_db()
+        self.assertEqual(parent.subchildren_count_proxy, 4)